@@ -142,16 +142,8 @@ class AudioStreamingApp {
             this.analyser.onaudioprocess = (event) => {
                 if (this.ws && this.ws.readyState === WebSocket.OPEN && this.isRecording) {
                     const inputData = event.inputBuffer.getChannelData(0);
-                    // Convert Float32Array to regular array for JSON serialization
-                    const audioData = Array.from(inputData);
-                    // Send audio data to server
-                    const message = {
-                        type: 'audio',
-                        buffer: audioData,
-                        chunkSize: inputData.length,
-                        sampleRate: this.audioContext.sampleRate
-                    };
-                    this.ws.send(JSON.stringify(message));
+                    // Send raw Float32 samples as a binary frame (no JSON encoding)
+                    this.ws.send(inputData);
                     this.frameCount++;
                 }
             };
@@ -1,10 +1,3 @@
-interface AudioMessage {
-    buffer: number[];
-    chunkSize: number;
-    sampleRate: number;
-    type: string;
-}
-
 interface VADResult {
     type: string;
     is_speech: boolean;
@@ -15,6 +8,7 @@ interface VADResult {
     speech_votes: number;
     frame_count: number;
     timestamp: string;
+    timestamp_ns: number;
 }
 
 class AudioStreamingApp {
@@ -185,18 +179,8 @@ class AudioStreamingApp {
                 if (this.ws && this.ws.readyState === WebSocket.OPEN && this.isRecording) {
                     const inputData = event.inputBuffer.getChannelData(0);
                     
-                    // Convert Float32Array to regular array for JSON serialization
-                    const audioData = Array.from(inputData);
-                    
-                    // Send audio data to server
-                    const message: AudioMessage = {
-                        type: 'audio',
-                        buffer: audioData,
-                        chunkSize: inputData.length,
-                        sampleRate: this.audioContext!.sampleRate
-                    };
-
-                    this.ws.send(JSON.stringify(message));
+                    // Send raw Float32 samples as a binary frame (no JSON encoding)
+                    this.ws.send(inputData);
                     this.frameCount++;
                 }
             };
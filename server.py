@@ -6,39 +6,148 @@ Sends VAD results back to UI for real-time display
 """
 
 import asyncio
+import contextlib
 import websockets
-import json
+import uvloop
+import msgspec
 import base64
 import numpy as np
-from scipy import signal
+from scipy import fft, signal
 from scipy.stats import entropy
 import logging
 from datetime import datetime
+import time
 import math
+from collections import deque
+from functools import lru_cache
+from numba import njit
 
-# Custom JSON encoder for numpy types
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        if isinstance(obj, np.floating):
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, (bool, np.bool_)):
-            return bool(obj)
-        return super(NumpyEncoder, self).default(obj)
+@lru_cache(maxsize=8)
+def hann_window(length):
+    """Hann window of the given length, cached since frame lengths repeat"""
+    window = signal.windows.hann(length).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+@njit(cache=True, fastmath=True)
+def time_features(audio_frame):
+    """Compute RMS energy and zero crossing rate of a frame in a single pass"""
+    n = len(audio_frame)
+    sum_squares = 0.0
+    zero_crossings = 0
+    prev_negative = audio_frame[0] < 0.0
+    for i in range(n):
+        sample = audio_frame[i]
+        sum_squares += sample * sample
+        negative = sample < 0.0
+        zero_crossings += negative ^ prev_negative  # Branchless sign change count
+        prev_negative = negative
+    rms = math.sqrt(sum_squares / n)
+    zcr = 2.0 * zero_crossings / n  # Same scale as sum(|diff(sign(x))|) / n
+    return rms, zcr
+
+@njit(cache=True, fastmath=True)
+def spectrum_flatness(spectrum):
+    """Geometric over arithmetic mean of the magnitude spectrum, in one pass (epsilon avoids log(0))"""
+    m = len(spectrum)
+    log_sum = 0.0
+    arithmetic_sum = 0.0
+    for k in range(m):
+        value = abs(spectrum[k]) + 1e-10
+        log_sum += math.log(value)
+        arithmetic_sum += value
+    return math.exp(log_sum / m) / (arithmetic_sum / m)
+
+def make_moving_average(history_size):
+    """
+    Build a moving average over the last history_size values.
+    The ring buffer, running sum and size are bound in the closure, so the
+    per-frame update does no attribute lookups.
+    """
+    history = [0.0] * history_size
+    total = 0.0
+    idx = 0
+    filled = 0
+    
+    def average(value):
+        nonlocal total, idx, filled
+        
+        # Replace the oldest entry and update the running sum
+        total += value - history[idx]
+        history[idx] = value
+        
+        idx = (idx + 1) % history_size
+        if filled < history_size:
+            filled += 1
+        elif idx == 0:
+            # Resum once per wrap so rounding error can't accumulate in the running sum
+            total = math.fsum(history)
+        
+        return total / filled
+    
+    return average
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Frames between INFO-level VAD summaries in the WebSocket handler
+SUMMARY_LOG_INTERVAL = 50
+
+# Per-connection buffering limits, so a slow client can't grow server memory without bound
+INCOMING_QUEUE_SIZE = 8   # Incoming messages buffered by websockets before reading pauses
+WRITE_LIMIT = 2 ** 15     # Transport write buffer high-water mark in bytes
+
+# Maximum WebSocket messages resampled together in one batch: the received message
+# plus everything websockets can have buffered behind it
+MAX_BATCH_MESSAGES = 1 + INCOMING_QUEUE_SIZE
+
+# VAD results waiting to be sent (oldest dropped when full). Holds a whole batch, since the
+# sender can't run until the batch is queued, so results only drop when the client falls behind.
+RESULT_QUEUE_SIZE = MAX_BATCH_MESSAGES
+
+class FeatureDecisions(msgspec.Struct, gc=False):
+    """Per-feature speech votes for a frame"""
+    rms: bool
+    zcr: bool
+    spectral_flatness: bool
+
+class VADResult(msgspec.Struct, gc=False):
+    """VAD decision and features for a frame, as sent to the frontend"""
+    is_speech: bool
+    confidence: float
+    speech_votes: int
+    frame_count: int
+    timestamp: str
+    timestamp_ns: int
+    rms_energy: float
+    rms_noise_floor: float
+    zcr: float
+    zcr_noise_floor: float
+    spectral_flatness: float
+    flatness_noise_floor: float
+    feature_decisions: FeatureDecisions
+    vad_decision_reason: str
+
+result_encoder = msgspec.json.Encoder()
+
 class AdvancedVAD:
     def __init__(self):
         self.sample_rate = 16000  # Target sample rate for VAD
         self.frame_size_ms = 20   # Frame size in milliseconds
         self.frame_size_samples = int(self.sample_rate * self.frame_size_ms / 1000)
         
+        # Polyphase resampler from browser rate (44.1kHz) to VAD rate
+        self.input_sample_rate = 44100
+        g = math.gcd(self.sample_rate, self.input_sample_rate)
+        self.up = self.sample_rate // g      # 160
+        self.down = self.input_sample_rate // g  # 441
+        num_taps = 20 * max(self.up, self.down) + 1
+        self._fir = (signal.firwin(num_taps, 1.0 / max(self.up, self.down), window='hann') * self.up).astype(np.float32)
+        self._resamp_tail = np.zeros(0, dtype=np.float32)  # Input samples carried into the next call
+        self._resamp_start = 0  # Absolute input index of the first tail sample
+        self._resamp_next = 0   # Absolute index of the next output sample to emit
+        
         # VAD parameters
         self.rms_threshold = 0.01
         self.zcr_threshold = 0.1
@@ -54,31 +163,76 @@ class AdvancedVAD:
         self.speech_frame_count = 0
         self.frame_count = 0
         
+        # Wall-clock ISO timestamp for the UI, refreshed at most once per second
+        self.timestamp_iso = datetime.now().isoformat()
+        self.timestamp_refreshed_ns = time.monotonic_ns()
+        
         # FIXED: Better initial noise floor values and adaptation
         self.noise_floor_rms = 0.0001  # Much lower initial value
         self.noise_floor_zcr = 0.01    # Much lower initial value
         self.noise_floor_flatness = 0.1  # Much lower initial value
         self.adaptation_alpha = 0.95  # Smoothing factor for noise floor adaptation
         
+        # Adaptive thresholds derived from the noise floors, updated only when they adapt
+        self.rms_adaptive_threshold = self.noise_floor_rms * 2.0  # 2x noise floor
+        self.zcr_adaptive_threshold = self.noise_floor_zcr * 1.5  # 1.5x noise floor
+        self.flatness_adaptive_threshold = self.noise_floor_flatness * 0.8  # Lower flatness = more speech-like
+        
         # Feature history for smoothing
         self.history_size = 10
-        self.rms_history = []
-        self.zcr_history = []
-        self.flatness_history = []
+        self.smooth_rms = make_moving_average(self.history_size)
+        self.smooth_zcr = make_moving_average(self.history_size)
+        self.smooth_flatness = make_moving_average(self.history_size)
+        
+        # Frames whose spectral flatness was deferred because RMS and ZCR already decided the vote;
+        # only the last history_size can still affect the moving average
+        self.pending_flatness_frames = deque(maxlen=self.history_size)
+        self.smoothed_flatness = 0.0
+        
+        # During steady silence flatness is only refreshed this often to keep its noise floor adapting
+        self.flatness_refresh_frames = 5
+        self.frames_since_flatness = self.flatness_refresh_frames  # Compute on the first frame
         
         logger.info("Advanced VAD initialized with RMS + Spectral Flatness + ZCR")
         logger.info(f"Sample rate: {self.sample_rate}Hz")
         logger.info(f"Frame size: {self.frame_size_samples} samples ({self.frame_size_ms}ms)")
         logger.info("Using RMS Energy + Spectral Flatness + Zero Crossing Rate")
     
-    def calculate_rms_energy(self, audio_frame):
-        """Calculate RMS energy of the audio frame"""
-        return np.sqrt(np.mean(audio_frame**2))
+    def resample(self, audio_data):
+        """
+        Resample a chunk of input audio to the VAD sample rate.
+        Filter state is carried between calls so chunk boundaries don't produce edge artifacts.
+        """
+        buffer = np.concatenate((self._resamp_tail, audio_data))
+        total_samples = self._resamp_start + len(buffer)
+        
+        # Keep the pipeline in float32 to halve memory traffic through the feature kernels
+        resampled = signal.upfirdn(self._fir, buffer, up=self.up, down=self.down).astype(np.float32, copy=False)
+        
+        # Only emit outputs whose input samples have all arrived
+        first = self._resamp_start * self.up // self.down
+        last = (total_samples * self.up - 1) // self.down
+        output = resampled[self._resamp_next - first:last - first + 1]
+        self._resamp_next = last + 1
+        
+        # Keep enough input to cover the filter for the next output, starting on a
+        # multiple of `down` so the upfirdn output grid stays aligned
+        keep_from = (self._resamp_next * self.down - (len(self._fir) - 1)) // self.up
+        keep_from = max(self._resamp_start, keep_from // self.down * self.down)
+        self._resamp_tail = buffer[keep_from - self._resamp_start:]
+        self._resamp_start = keep_from
+        
+        return output
     
-    def calculate_zero_crossing_rate(self, audio_frame):
-        """Calculate zero crossing rate"""
-        zero_crossings = np.sum(np.abs(np.diff(np.sign(audio_frame))))
-        return zero_crossings / len(audio_frame)
+    def resample_batch(self, chunks):
+        """Resample consecutive input chunks in one filter pass, returning one output frame per chunk"""
+        first = self._resamp_next
+        consumed = self._resamp_start + len(self._resamp_tail)
+        resampled = self.resample(np.concatenate(chunks))
+        
+        # Split where each chunk's outputs end, matching what per-chunk resample() calls would emit
+        ends = consumed + np.cumsum([len(chunk) for chunk in chunks[:-1]], dtype=np.int64)
+        return np.split(resampled, (ends * self.up - 1) // self.down + 1 - first)
     
     def calculate_spectral_flatness(self, audio_frame):
         """
@@ -86,72 +240,79 @@ class AdvancedVAD:
         Lower values indicate more tonal content (speech)
         Higher values indicate more noisy content
         """
-        # Apply window function
-        windowed = audio_frame * signal.windows.hann(len(audio_frame))
+        # Apply window function and compute FFT (real input, so only the non-negative frequency bins are needed).
+        # Frames are ~743 samples (prime), so zero-pad to a fast FFT length; workers=1 avoids thread startup.
+        n = len(audio_frame)
+        spectrum = fft.rfft(audio_frame * hann_window(n), n=fft.next_fast_len(n, real=True), workers=1)
         
-        # Compute FFT
-        fft = np.fft.fft(windowed)
-        magnitude = np.abs(fft[:len(fft)//2])
-        
-        # Avoid log(0) by adding small epsilon
-        magnitude = magnitude + 1e-10
-        
-        # Calculate geometric mean
-        geometric_mean = np.exp(np.mean(np.log(magnitude)))
-        
-        # Calculate arithmetic mean
-        arithmetic_mean = np.mean(magnitude)
-        
-        # Spectral flatness
-        if arithmetic_mean > 0:
-            return geometric_mean / arithmetic_mean
-        else:
-            return 0.0
+        return spectrum_flatness(spectrum)
     
     def process_frame(self, audio_frame):
         """Process a single audio frame and return VAD decision"""
         self.frame_count += 1
         
-        # Calculate features
-        rms = self.calculate_rms_energy(audio_frame)
-        zcr = self.calculate_zero_crossing_rate(audio_frame)
-        flatness = self.calculate_spectral_flatness(audio_frame)
-        
-        # Add to history for smoothing
-        self.rms_history.append(rms)
-        self.zcr_history.append(zcr)
-        self.flatness_history.append(flatness)
-        
-        # Keep history size manageable
-        if len(self.rms_history) > self.history_size:
-            self.rms_history.pop(0)
-            self.zcr_history.pop(0)
-            self.flatness_history.pop(0)
+        # Calculate time-domain features
+        rms, zcr = time_features(audio_frame)
         
         # Calculate smoothed features
-        smoothed_rms = np.mean(self.rms_history)
-        smoothed_zcr = np.mean(self.zcr_history)
-        smoothed_flatness = np.mean(self.flatness_history)
+        smoothed_rms = self.smooth_rms(rms)
+        smoothed_zcr = self.smooth_zcr(zcr)
         
         # FIXED: Always adapt noise floors during silence (not just first few frames)
-        if not self.is_voice_active and self.hangover_counter == 0:
-            # Only update noise floors during actual silence (not hangover)
-            self.noise_floor_rms = self.adaptation_alpha * self.noise_floor_rms + (1 - self.adaptation_alpha) * smoothed_rms
-            self.noise_floor_zcr = self.adaptation_alpha * self.noise_floor_zcr + (1 - self.adaptation_alpha) * smoothed_zcr
-            self.noise_floor_flatness = self.adaptation_alpha * self.noise_floor_flatness + (1 - self.adaptation_alpha) * smoothed_flatness
+        # Only update noise floors during actual silence (not hangover)
+        adapt_noise_floors = not self.is_voice_active and self.hangover_counter == 0
+        alpha = self.adaptation_alpha
+        if adapt_noise_floors:
+            noise_floor_rms = alpha * self.noise_floor_rms + (1 - alpha) * smoothed_rms
+            noise_floor_zcr = alpha * self.noise_floor_zcr + (1 - alpha) * smoothed_zcr
             
             # Ensure noise floors don't go too extreme
-            self.noise_floor_rms = max(0.0001, self.noise_floor_rms)
-            self.noise_floor_zcr = np.clip(self.noise_floor_zcr, 0.01, 0.9)
-            self.noise_floor_flatness = np.clip(self.noise_floor_flatness, 0.01, 0.99)
+            self.noise_floor_rms = max(0.0001, noise_floor_rms)
+            self.noise_floor_zcr = max(0.01, min(0.9, noise_floor_zcr))
+            
+            self.rms_adaptive_threshold = self.noise_floor_rms * 2.0
+            self.zcr_adaptive_threshold = self.noise_floor_zcr * 1.5
         
         # Multi-feature VAD decision with adaptive thresholds
-        rms_decision = smoothed_rms > (self.noise_floor_rms * 2.0)  # 2x noise floor
-        zcr_decision = smoothed_zcr > (self.noise_floor_zcr * 1.5)  # 1.5x noise floor
-        flatness_decision = smoothed_flatness < (self.noise_floor_flatness * 0.8)  # Lower flatness = more speech-like
+        rms_decision = smoothed_rms > self.rms_adaptive_threshold
+        zcr_decision = smoothed_zcr > self.zcr_adaptive_threshold
+        
+        # When RMS and ZCR agree the flatness vote can't change the majority, so the FFT is deferred.
+        # On a split vote the deferred frames are caught up first. During steady silence the flatness
+        # noise floor still needs updates, so flatness is refreshed from the current frame every
+        # flatness_refresh_frames frames and held for the frames skipped since. This is an approximation:
+        # the smoothed flatness, its noise floor and so some decisions after silence differ slightly
+        # from computing flatness on every frame.
+        self.pending_flatness_frames.append(audio_frame)
+        self.frames_since_flatness += 1
+        flatness_updated = False
+        if rms_decision != zcr_decision:
+            for frame in self.pending_flatness_frames:
+                self.smoothed_flatness = self.smooth_flatness(self.calculate_spectral_flatness(frame))
+            flatness_updated = True
+        elif adapt_noise_floors and self.frames_since_flatness >= self.flatness_refresh_frames:
+            # Hold the refreshed value for every deferred frame, so the history still spans history_size frames
+            flatness = self.calculate_spectral_flatness(audio_frame)
+            for _ in self.pending_flatness_frames:
+                self.smoothed_flatness = self.smooth_flatness(flatness)
+            flatness_updated = True
+        if flatness_updated:
+            self.pending_flatness_frames.clear()
+            self.frames_since_flatness = 0
+        smoothed_flatness = self.smoothed_flatness
+        
+        if adapt_noise_floors:
+            noise_floor_flatness = alpha * self.noise_floor_flatness + (1 - alpha) * smoothed_flatness
+            self.noise_floor_flatness = max(0.01, min(0.99, noise_floor_flatness))
+            self.flatness_adaptive_threshold = self.noise_floor_flatness * 0.8
+        
+        # Reported decision always reflects the reported (possibly held) flatness value. When flatness
+        # wasn't computed this frame the vote agrees with RMS/ZCR, which can't change the majority.
+        flatness_decision = smoothed_flatness < self.flatness_adaptive_threshold
+        flatness_vote = flatness_decision if flatness_updated else rms_decision
         
         # Combine decisions (majority vote)
-        decisions = [rms_decision, zcr_decision, flatness_decision]
+        decisions = [rms_decision, zcr_decision, flatness_vote]
         speech_votes = sum(decisions)
         
         # Require at least 2 out of 3 features to indicate speech
@@ -172,29 +333,83 @@ class AdvancedVAD:
         else:
             self.is_voice_active = False
         
-        # Prepare result - FIXED: Convert numpy types to Python types
-        result = {
-            "is_speech": bool(self.is_voice_active),
-            "confidence": float(speech_votes / 3.0),
-            "speech_votes": int(speech_votes),
-            "frame_count": int(self.frame_count),
-            "timestamp": datetime.now().isoformat(),
-            "rms_energy": float(smoothed_rms),
-            "rms_noise_floor": float(self.noise_floor_rms),
-            "zcr": float(smoothed_zcr),
-            "zcr_noise_floor": float(self.noise_floor_zcr),
-            "spectral_flatness": float(smoothed_flatness),
-            "flatness_noise_floor": float(self.noise_floor_flatness),
-            "feature_decisions": {
-                "rms": bool(rms_decision),
-                "zcr": bool(zcr_decision),
-                "spectral_flatness": bool(flatness_decision)
-            },
-            "vad_decision_reason": f"RMS={rms_decision}, ZCR={zcr_decision}, Flatness={flatness_decision}"
-        }
+        now_ns = time.monotonic_ns()
+        if now_ns - self.timestamp_refreshed_ns >= 1_000_000_000:
+            self.timestamp_iso = datetime.now().isoformat()
+            self.timestamp_refreshed_ns = now_ns
+        
+        # Prepare result
+        result = VADResult(
+            is_speech=self.is_voice_active,
+            confidence=speech_votes / 3.0,
+            speech_votes=speech_votes,
+            frame_count=self.frame_count,
+            timestamp=self.timestamp_iso,
+            timestamp_ns=now_ns,
+            rms_energy=smoothed_rms,
+            rms_noise_floor=self.noise_floor_rms,
+            zcr=smoothed_zcr,
+            zcr_noise_floor=self.noise_floor_zcr,
+            spectral_flatness=smoothed_flatness,
+            flatness_noise_floor=self.noise_floor_flatness,
+            feature_decisions=FeatureDecisions(
+                rms=rms_decision,
+                zcr=zcr_decision,
+                spectral_flatness=flatness_decision
+            ),
+            vad_decision_reason=(
+                f"RMS={rms_decision}, ZCR={zcr_decision}, Flatness={flatness_decision}"
+                if flatness_updated else
+                f"RMS={rms_decision}, ZCR={zcr_decision}, Flatness vote inferred={flatness_vote} (not computed)"
+            )
+        )
         
         return result
 
+def parse_audio_message(message):
+    """Extract float32 audio samples from a binary or JSON WebSocket message"""
+    if isinstance(message, (bytes, bytearray)):
+        # Binary frames carry raw little-endian float32 samples
+        return np.frombuffer(message, dtype='<f4')
+    data = msgspec.json.decode(message)
+    return np.array(data['buffer'], dtype=np.float32)
+
+def log_vad_result(vad_result):
+    """Log a VAD result (per-frame detail only at DEBUG, it runs on every frame)"""
+    status = "🎤 SPEECH DETECTED" if vad_result.is_speech else "🔇 SILENCE"
+    if logger.isEnabledFor(logging.DEBUG):
+        decisions = vad_result.feature_decisions
+        logger.debug("Frame %d (%s):", vad_result.frame_count, vad_result.timestamp)
+        logger.debug("  %s - Confidence: %.3f", status, vad_result.confidence)
+        logger.debug("  RMS Energy: %.6f, Noise Floor: %.6f", vad_result.rms_energy, vad_result.rms_noise_floor)
+        logger.debug("  ZCR: %.3f, Noise Floor: %.3f", vad_result.zcr, vad_result.zcr_noise_floor)
+        logger.debug("  Spectral Flatness: %.3f, Noise Floor: %.3f", vad_result.spectral_flatness, vad_result.flatness_noise_floor)
+        logger.debug("  Speech Votes: %d/3", vad_result.speech_votes)
+        logger.debug("  Feature Decisions: RMS=%s, ZCR=%s, Flatness=%s", decisions.rms, decisions.zcr, decisions.spectral_flatness)
+        logger.debug("  VAD Decision Reason: %s", vad_result.vad_decision_reason)
+        logger.debug("---")
+    if vad_result.frame_count % SUMMARY_LOG_INTERVAL == 0:
+        logger.info("Frame %d: %s - Confidence: %.3f, Votes: %d/3",
+                    vad_result.frame_count, status, vad_result.confidence, vad_result.speech_votes)
+
+def enqueue_result(results, result):
+    """Queue a result for sending, dropping the oldest one if the client has fallen behind"""
+    try:
+        results.put_nowait(result)
+    except asyncio.QueueFull:
+        results.get_nowait()
+        results.put_nowait(result)
+
+async def send_results(websocket, results):
+    """Send queued VAD results to the client until the connection closes"""
+    try:
+        while True:
+            await websocket.send(await results.get())
+    except websockets.exceptions.ConnectionClosed:
+        pass
+    except Exception as e:
+        logger.error(f"Error sending results: {e}")
+
 async def audio_websocket_handler(websocket, path):
     """Handle WebSocket connections for audio streaming"""
     logger.info("Client connected")
@@ -202,38 +417,42 @@ async def audio_websocket_handler(websocket, path):
     # Initialize VAD for this connection
     vad = AdvancedVAD()
     
+    # Results are sent from a separate task so a slow client can't stall frame processing
+    results = asyncio.Queue(maxsize=RESULT_QUEUE_SIZE)
+    sender = asyncio.create_task(send_results(websocket, results))
+    
     try:
         async for message in websocket:
+            # Drain messages that queued up while the previous batch was processed
+            messages = [message]
+            while websocket.messages and len(messages) < MAX_BATCH_MESSAGES:
+                messages.append(await websocket.recv())
+            
             try:
-                # Parse the audio data
-                data = json.loads(message)
-                audio_data = np.array(data['buffer'], dtype=np.float32)
-                
-                # Resample from 44.1kHz to 16kHz for VAD
-                num_samples = len(audio_data)
-                target_samples = int(num_samples * 16000 / 44100)
-                resampled_audio = signal.resample(audio_data, target_samples)
-                
-                # Process the audio frame
-                vad_result = vad.process_frame(resampled_audio)
+                # Parse each message on its own so one bad message doesn't drop the rest of the batch
+                chunks = []
+                for pending in messages:
+                    try:
+                        chunks.append(parse_audio_message(pending))
+                    except msgspec.DecodeError:
+                        logger.error("Failed to parse JSON message")
+                    except (ValueError, KeyError, TypeError) as e:
+                        logger.error(f"Error processing message: {e}")
+                if not chunks:
+                    continue
                 
-                # Log the result
-                status = "🎤 SPEECH DETECTED" if vad_result["is_speech"] else "🔇 SILENCE"
-                logger.info(f"Frame {vad_result['frame_count']} ({vad_result['timestamp']}):")
-                logger.info(f"  {status} - Confidence: {vad_result['confidence']:.3f}")
-                logger.info(f"  RMS Energy: {vad_result['rms_energy']:.6f}, Noise Floor: {vad_result['rms_noise_floor']:.6f}")
-                logger.info(f"  ZCR: {vad_result['zcr']:.3f}, Noise Floor: {vad_result['zcr_noise_floor']:.3f}")
-                logger.info(f"  Spectral Flatness: {vad_result['spectral_flatness']:.3f}, Noise Floor: {vad_result['flatness_noise_floor']:.3f}")
-                logger.info(f"  Speech Votes: {vad_result['speech_votes']}/3")
-                logger.info(f"  Feature Decisions: RMS={vad_result['feature_decisions']['rms']}, ZCR={vad_result['feature_decisions']['zcr']}, Flatness={vad_result['feature_decisions']['spectral_flatness']}")
-                logger.info(f"  VAD Decision Reason: {vad_result['vad_decision_reason']}")
-                logger.info("---")
+                # Resample from 44.1kHz to 16kHz for VAD, one filter pass per batch
+                for resampled_audio in vad.resample_batch(chunks):
+                    if len(resampled_audio) == 0:
+                        continue
+                    
+                    # Process the audio frame
+                    vad_result = vad.process_frame(resampled_audio)
+                    log_vad_result(vad_result)
+                    
+                    # Send result back to frontend (decoded so it goes out as a text frame)
+                    enqueue_result(results, result_encoder.encode(vad_result).decode())
                 
-                # Send result back to frontend
-                await websocket.send(json.dumps(vad_result, cls=NumpyEncoder))
-                
-            except json.JSONDecodeError:
-                logger.error("Failed to parse JSON message")
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
                 
@@ -241,15 +460,31 @@ async def audio_websocket_handler(websocket, path):
         logger.info("Client disconnected gracefully")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
+    finally:
+        sender.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sender
+
+def warm_up_kernels():
+    """Compile the Numba feature kernels before serving, so the first frame doesn't block the event loop"""
+    frame = np.zeros(743, dtype=np.float32)  # One 2048-sample browser chunk resampled to 16kHz
+    time_features(frame)
+    spectrum = fft.rfft(frame * hann_window(len(frame)), n=fft.next_fast_len(len(frame), real=True), workers=1)
+    spectrum_flatness(spectrum)
 
 async def main():
     """Main function to start the WebSocket server"""
     logger.info("Starting Advanced VAD WebSocket Server...")
     logger.info("Using multi-feature signal processing for robust VAD")
     
+    warm_up_kernels()
+    
     try:
         # Start the WebSocket server
-        start_server = websockets.serve(audio_websocket_handler, "0.0.0.0", 3001)
+        start_server = websockets.serve(
+            audio_websocket_handler, "0.0.0.0", 3001,
+            max_queue=INCOMING_QUEUE_SIZE, write_limit=WRITE_LIMIT
+        )
         logger.info("Server started on ws://localhost:3001")
         
         # Run the server
@@ -261,6 +496,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        # libuv-backed event loop, cheaper per-message dispatch than the default asyncio loop
+        uvloop.run(main())
     except KeyboardInterrupt:
         logger.info("Server stopped by user")